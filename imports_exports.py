@@ -2,20 +2,49 @@
 This program is an Import/Export Management System that allows users to filter, sort, add, update, delete, search, view summaries, and export transactions to CSV files.
 """
 
+import bisect
 import csv
+import heapq
+import math
+import os
+import pickle
+import sys
+import tempfile
 from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+
+# Buffer size in bytes for reading and writing CSV files.
+CSV_BUFFER_SIZE = 1 << 20
+
+# Sort key that reads a transaction's value without a Python-level call.
+_VALUE_KEY = attrgetter("value")
+
+# Sets an attribute without going through Transaction.__setattr__.
+_set_slot = object.__setattr__
 
 class Transaction:
     """
     Represents import/export transactions.
     
+    Setting a field after initialization counts as an edit, so ImportExportSystem can
+    discard indexes built before it. Setting country or product also refreshes its
+    casefolded copy.
+    
     Attributes:
         transaction_ID (str): A unique identifier for each transaction.
         product (str): The specific product involved in the transaction.
         country (str): The country of origin or destination.
         value (float): The monetary value of the product in USD.
         date (datetime): The date the transaction occurred.
+        _product_lc (str): The casefolded product name, used for matching.
+        _country_lc (str): The casefolded country name, used for matching.
+        _edits (int): The number of edits made to any transaction's indexed fields
+            after initialization, shared by all transactions.
     """
+    __slots__ = ("transaction_ID", "product", "country", "value", "date", "_product_lc", "_country_lc")
+    _edits = 0
+    
     def __init__(self, transaction_ID, product, country, value, date):
         """
         Initializes a Transaction object with the given attributes.
@@ -28,20 +57,70 @@ class Transaction:
             date (datetime): The date the transaction took place.
             
         Side effects:
-            Initializes the Transaction object with the given attributes.
+            Initializes the Transaction object with the given attributes and
+            caches the casefolded product and country names.
+        """
+        _set_slot(self, "transaction_ID", transaction_ID)
+        _set_slot(self, "product", product)
+        _set_slot(self, "country", country)
+        _set_slot(self, "value", value)
+        _set_slot(self, "date", date)
+        _set_slot(self, "_product_lc", product.casefold())
+        _set_slot(self, "_country_lc", country.casefold())
+    
+    def __setattr__(self, name, value):
+        """
+        Sets an attribute, counting the edit and refreshing any casefolded copy.
+        
+        Args:
+            name (str): The name of the attribute to set.
+            value: The new value of the attribute.
+            
+        Side effects:
+            Sets the attribute and, for any field other than the casefolded copies,
+            increments Transaction._edits. For country or product also updates the
+            casefolded copy.
         """
-        self.transaction_ID = transaction_ID
-        self.product = product
-        self.country = country
-        self.value = value
-        self.date = date
+        _set_slot(self, name, value)
+        if name == "country":
+            _set_slot(self, "_country_lc", value.casefold())
+        elif name == "product":
+            _set_slot(self, "_product_lc", value.casefold())
+        elif name not in ("transaction_ID", "value", "date"):
+            return
+        Transaction._edits += 1
         
+
 class ImportExportSystem:
     """
     Manages a list of transactions and provides methods to analyze them.
     
+    Transactions should be changed through add_transaction, update_transaction and
+    delete_transaction, which keep the indexes below current. The indexes are rebuilt
+    if transactions is replaced or its length changes directly. ID lookups also check
+    the transaction at the indexed position, so replacing an element of the list is
+    noticed by search, update and delete. Setting a field of a Transaction directly,
+    such as the value of one returned by a search, is also detected.
+    
     Attributes:
         transactions (list): A list of Transaction objects.
+        _by_id (dict): Maps each transaction ID to the positions of its transactions
+            in ascending order. IDs are not required to be unique.
+        _indexed_transactions (list): The list the indexes were built from.
+        _indexed_length (int): The length of transactions the indexes describe.
+        _indexed_edits (int): The value of Transaction._edits the indexes describe.
+        _country_index (dict): Maps each casefolded country to the positions of its
+            transactions, or None until it is next needed.
+        _product_index (dict): Maps each casefolded product to the positions of its
+            transactions, or None until it is next needed.
+        _ascending_values (list): (value, position) pairs for all transactions in
+            ascending order of value, or None until it is next needed.
+        _descending_values (list): (-value, position) pairs for all transactions in
+            descending order of value, or None until it is next needed.
+        _dates (list): The dates of all transactions in ascending order, or None
+            until it is next needed.
+        _date_positions (list): The positions of the transactions in the same order
+            as _dates, or None until it is next needed.
     """
     def __init__(self, transactions):
         """
@@ -51,9 +130,139 @@ class ImportExportSystem:
             transactions (list): A list of Transaction objects.
             
         Side effects:
-            Initializes the ImportExportSystem with the given list of transactions.
+            Initializes the ImportExportSystem with the given list of transactions
+            and builds an index of the transactions by ID.
         """
         self.transactions = transactions
+        self._build_id_index()
+        self._invalidate_indexes()
+    
+    def _build_id_index(self):
+        """
+        Builds the index of the transactions by ID from the current transactions.
+        
+        Side effects:
+            Sets _by_id, _indexed_transactions, _indexed_length and _indexed_edits.
+        """
+        self._by_id = {}
+        for i, t in enumerate(self.transactions):
+            self._by_id.setdefault(t.transaction_ID, []).append(i)
+        self._indexed_transactions = self.transactions
+        self._indexed_length = len(self.transactions)
+        self._indexed_edits = Transaction._edits
+    
+    def _sync_indexes(self):
+        """
+        Rebuilds the indexes if transactions was replaced, resized or edited outside this class.
+        
+        Side effects:
+            Rebuilds _by_id and resets the other indexes when they no longer describe transactions.
+        """
+        if (self.transactions is not self._indexed_transactions or len(self.transactions) != self._indexed_length
+                or Transaction._edits != self._indexed_edits):
+            self._build_id_index()
+            self._invalidate_indexes()
+    
+    def _find_position(self, transaction_ID):
+        """
+        Returns the position of the first transaction with the given ID.
+        
+        The position from _by_id is checked against the transaction stored there. If
+        it does not match, or the ID is not indexed, the transactions are scanned in
+        case an element of the list was replaced directly.
+        
+        Args:
+            transaction_ID (str): The unique identifier to look up.
+            
+        Returns:
+            int: The position of the transaction, or None if no transaction has the ID.
+            
+        Side effects:
+            Rebuilds the indexes if the scan finds that _by_id is out of date.
+        """
+        self._sync_indexes()
+        positions = self._by_id.get(transaction_ID)
+        if positions is not None and self.transactions[positions[0]].transaction_ID == transaction_ID:
+            return positions[0]
+        for i, t in enumerate(self.transactions):
+            if t.transaction_ID == transaction_ID:
+                self._build_id_index()
+                self._invalidate_indexes()
+                return i
+        if positions is not None:
+            self._build_id_index()
+            self._invalidate_indexes()
+        return None
+    
+    def _build_indexes(self):
+        """
+        Builds the country and product indexes if they are not already built.
+        
+        Side effects:
+            Sets _country_index and _product_index from the current transactions.
+        """
+        if self._country_index is not None:
+            return
+        country_index = {}
+        product_index = {}
+        for i, t in enumerate(self.transactions):
+            country_index.setdefault(t._country_lc, []).append(i)
+            product_index.setdefault(t._product_lc, []).append(i)
+        self._country_index = country_index
+        self._product_index = product_index
+    
+    def _value_order(self, descending):
+        """
+        Returns all transactions' positions ordered by value, building the order if needed.
+        
+        Ties keep the order of the transactions list, as sorted() would.
+        
+        Args:
+            descending (bool): If True, return the descending order; otherwise, the ascending order.
+            
+        Returns:
+            list: (value, position) pairs, with the value negated for the descending order.
+            
+        Side effects:
+            Sets _ascending_values or _descending_values the first time each order is needed.
+        """
+        if descending:
+            if self._descending_values is None:
+                self._descending_values = sorted((-t.value, i) for i, t in enumerate(self.transactions))
+            return self._descending_values
+        if self._ascending_values is None:
+            self._ascending_values = sorted((t.value, i) for i, t in enumerate(self.transactions))
+        return self._ascending_values
+    
+    def _date_order(self):
+        """
+        Returns all transactions' dates and positions ordered by date, building the order if needed.
+        
+        Returns:
+            tuple: The sorted dates and the positions of their transactions, as two parallel lists.
+            
+        Side effects:
+            Sets _dates and _date_positions the first time the order is needed.
+        """
+        if self._dates is None:
+            pairs = sorted((t.date, i) for i, t in enumerate(self.transactions))
+            self._dates = [date for date, _ in pairs]
+            self._date_positions = [i for _, i in pairs]
+        return self._dates, self._date_positions
+    
+    def _invalidate_indexes(self):
+        """
+        Discards the country, product, value and date indexes after the transactions change.
+        
+        Side effects:
+            Resets the indexes so they are rebuilt on next use.
+        """
+        self._country_index = None
+        self._product_index = None
+        self._ascending_values = None
+        self._descending_values = None
+        self._dates = None
+        self._date_positions = None
     
     def total_trade_value(self, transactions):
         """
@@ -63,12 +272,14 @@ class ImportExportSystem:
             transactions (list[Transaction]): The list of transactions to calculate the total value for.
     
         Returns:
-            float: The total value of the given transactions.
+            float: The total value of the given transactions, accurately rounded.
         """
-        total_value = 0
-        for t in transactions:
-            total_value += t.value
-        return total_value
+        try:
+            return math.fsum(t.value for t in transactions)
+        except (ValueError, OverflowError):
+            # fsum rejects inf plus -inf and overflowing partial sums, where sum()
+            # gives nan or inf as the total did before.
+            return sum(t.value for t in transactions)
 
     def filter_transactions(self, date_range=None, country=None, product=None, min_value=None, max_value=None):
         """
@@ -84,19 +295,52 @@ class ImportExportSystem:
         Returns:
             list: A list of Transaction objects that meet the filtering criteria.
         """
+        self._sync_indexes()
+        country_lc = country.casefold() if country is not None else None
+        product_lc = product.casefold() if product is not None else None
+        if date_range is not None:
+            start_date, end_date = date_range
+        candidates = self.transactions
+        # Only visit the transactions matched by the most selective indexed
+        # criterion, and skip checking that criterion again in the loop below.
+        positions = None
+        selected = None
+        if country_lc is not None or product_lc is not None:
+            self._build_indexes()
+            if country_lc is not None:
+                positions, selected = self._country_index.get(country_lc, []), "country"
+            if product_lc is not None:
+                product_positions = self._product_index.get(product_lc, [])
+                if positions is None or len(product_positions) < len(positions):
+                    positions, selected = product_positions, "product"
+        # Positions cut from the date order have to be sorted back into list
+        # order, which only pays off when they are under half the candidates.
+        if date_range is not None:
+            dates, date_positions = self._date_order()
+            lo = bisect.bisect_left(dates, start_date)
+            hi = bisect.bisect_right(dates, end_date)
+            if 2 * (hi - lo) < len(candidates if positions is None else positions):
+                positions, selected = sorted(date_positions[lo:hi]), "date"
+        if selected == "country":
+            country_lc = None
+        elif selected == "product":
+            product_lc = None
+        elif selected == "date":
+            date_range = None
+        if positions is not None:
+            candidates = [self.transactions[i] for i in positions]
         filtered_transactions = []
-        for t in self.transactions:
-            if date_range:
-                start_date, end_date = date_range
-                if not (start_date <= t.date <= end_date):
-                    continue
-            if country and t.country.lower() != country.lower():
+        for t in candidates:
+            # Cheap numeric comparisons first so rejected rows skip the rest.
+            if min_value is not None and t.value < min_value:
+                continue
+            if max_value is not None and t.value > max_value:
                 continue
-            if product and t.product.lower() != product.lower():
+            if date_range is not None and not (start_date <= t.date <= end_date):
                 continue
-            if min_value and t.value < min_value:
+            if country_lc is not None and t._country_lc != country_lc:
                 continue
-            if max_value and t.value > max_value:
+            if product_lc is not None and t._product_lc != product_lc:
                 continue
             filtered_transactions.append(t)
         return filtered_transactions
@@ -112,8 +356,24 @@ class ImportExportSystem:
             value (float): The monetary value of the transaction.
             date (datetime): The date the transaction took place.
         """
-        transaction = Transaction(transaction_ID, country, product, value, date)
+        self._sync_indexes()
+        transaction = Transaction(transaction_ID=transaction_ID, product=product, country=country, value=value, date=date)
+        position = len(self.transactions)
+        self._by_id.setdefault(transaction_ID, []).append(position)
         self.transactions.append(transaction)
+        self._indexed_length += 1
+        # Keep any built indexes current instead of rebuilding them later.
+        if self._country_index is not None:
+            self._country_index.setdefault(transaction._country_lc, []).append(position)
+            self._product_index.setdefault(transaction._product_lc, []).append(position)
+        if self._ascending_values is not None:
+            bisect.insort(self._ascending_values, (value, position))
+        if self._descending_values is not None:
+            bisect.insort(self._descending_values, (-value, position))
+        if self._dates is not None:
+            index = bisect.bisect_right(self._dates, date)
+            self._dates.insert(index, date)
+            self._date_positions.insert(index, position)
     
     def update_transaction(self, transaction_ID, country=None, product=None, value=None, date=None):
         """
@@ -129,18 +389,22 @@ class ImportExportSystem:
         Returns:
             boolean: True if the transaction was updated successfully, False otherwise.
         """
-        for t in self.transactions:
-            if t.transaction_ID == transaction_ID:
-                if country:
-                    t.country = country
-                if product:
-                    t.product = product
-                if value:
-                    t.value = value
-                if date:
-                    t.date = date
-                return True
-        return False
+        i = self._find_position(transaction_ID)
+        if i is None:
+            return False
+        t = self.transactions[i]
+        self._invalidate_indexes()
+        if country is not None:
+            t.country = country
+        if product is not None:
+            t.product = product
+        if value is not None:
+            t.value = value
+        if date is not None:
+            t.date = date
+        # The indexes were discarded above, so these edits need no rebuild.
+        self._indexed_edits = Transaction._edits
+        return True
     
     def delete_transaction(self, transaction_ID):
         """
@@ -151,12 +415,33 @@ class ImportExportSystem:
             
         Returns:
             boolean: True if the transaction was deleted successfully, False otherwise.
+            
+        Side effects:
+            Moves the last transaction into the deleted transaction's position.
         """
-        for t in self.transactions:
-            if t.transaction_ID == transaction_ID:
-                self.transactions.remove(t)
-                return True
-        return False
+        i = self._find_position(transaction_ID)
+        if i is None:
+            return False
+        self._invalidate_indexes()
+        end = len(self.transactions) - 1
+        last_positions = self._by_id.get(self.transactions[end].transaction_ID)
+        if not last_positions or last_positions[-1] != end:
+            # The last transaction was replaced directly, so reindex before moving it.
+            self._build_id_index()
+        positions = self._by_id[transaction_ID]
+        positions.remove(i)
+        if not positions:
+            del self._by_id[transaction_ID]
+        last = self.transactions.pop()
+        self._indexed_length -= 1
+        end = len(self.transactions)
+        if i < end:
+            self.transactions[i] = last
+            # The moved transaction was at the highest position for its ID.
+            last_positions = self._by_id[last.transaction_ID]
+            last_positions.pop()
+            bisect.insort(last_positions, i)
+        return True
     
     def search_transaction_by_id(self, transaction_ID):
         """
@@ -166,24 +451,43 @@ class ImportExportSystem:
             transaction_ID (str): The unique identifier to search for.
             
         Returns:
-            Transaction: The Transaction object with the given ID, or None if not found.
+            Transaction: The first Transaction object with the given ID, or None if not found.
         """
-        for t in self.transactions:
-            if t.transaction_ID == transaction_ID:
-                return t
-        return None
+        i = self._find_position(transaction_ID)
+        if i is None:
+            return None
+        return self.transactions[i]
     
-    def sort_transactions_by_value(self, transactions, descending):
+    def sort_transactions_by_value(self, transactions, descending, top_k=None):
         """
         Sorts transactions by value in either ascending or descending order.
         
         Args:
+            transactions (list[Transaction]): The list of transactions to sort.
             descending (bool): If True, sort in descending order; otherwise, sort in ascending order.
+            top_k (int): If given, only the first top_k transactions of the sorted order are
+                returned, which avoids sorting the whole list.
             
         Returns:
             list: A list of Transaction objects sorted by value.
+            
+        Raises:
+            ValueError: If top_k is negative.
         """
-        return sorted(transactions, key=lambda x: x.value, reverse=descending)
+        if top_k is not None and top_k < 0:
+            raise ValueError("top_k must not be negative")
+        if transactions is self.transactions:
+            self._sync_indexes()
+            # The order of all transactions is cached between calls.
+            order = self._value_order(descending)
+            if top_k is not None:
+                order = order[:top_k]
+            return [transactions[i] for _, i in order]
+        if top_k is not None:
+            if descending:
+                return heapq.nlargest(top_k, transactions, key=_VALUE_KEY)
+            return heapq.nsmallest(top_k, transactions, key=_VALUE_KEY)
+        return sorted(transactions, key=_VALUE_KEY, reverse=descending)
     
     def export_transactions_to_csv(self, transactions, filename):
         """
@@ -196,11 +500,10 @@ class ImportExportSystem:
         Side effects:
             Writes transaction data to a CSV file with the given filename.
         """
-        with open(filename, mode='w', newline='') as file:
+        with open(filename, mode='w', newline='', buffering=CSV_BUFFER_SIZE) as file:
             writer = csv.writer(file)
             writer.writerow(["Transaction_ID", "Country", "Product", "Value", "Date"])
-            for t in transactions:
-                writer.writerow([t.transaction_ID, t.country, t.product, t.value, t.date.strftime("%d-%m-%Y")])
+            writer.writerows((t.transaction_ID, t.country, t.product, t.value, format_date(t.date)) for t in transactions)
 
     def generate_transaction_summary(self, transactions):
         """
@@ -223,18 +526,79 @@ class ImportExportSystem:
         summary = [total_transactions, total_value, average_value]
         return summary
 
+@lru_cache(maxsize=None)
 def parse_date(date):
     """
     Converts a date string in 'dd-mm-yyyy' format to a datetime object.
+    
+    Results are cached, so repeated date strings in the dataset or in user
+    input are only parsed once.
         
     Args:
         date (str): The date string to be parsed.
         
     Returns:
         datetime: A datetime object representing the given date.
+        
+    Raises:
+        ValueError: If the date string does not match the 'dd-mm-yyyy' format.
     """
+    # isdigit() also accepts non-ASCII digits, which strptime rejects.
+    if (len(date) == 10 and date.isascii() and date[2] == "-" and date[5] == "-"
+            and date[:2].isdigit() and date[3:5].isdigit() and date[6:].isdigit()):
+        try:
+            return datetime(int(date[6:]), int(date[3:5]), int(date[:2]))
+        except ValueError:
+            pass
     return datetime.strptime(date, "%d-%m-%Y")
 
+@lru_cache(maxsize=None)
+def format_date(date):
+    """
+    Converts a datetime object to a date string in 'dd-mm-yyyy' format.
+    
+    Results are cached because many transactions share the same date.
+        
+    Args:
+        date (datetime): The date to be formatted.
+        
+    Returns:
+        str: The date formatted as 'dd-mm-yyyy'.
+    """
+    return f"{date.day:02d}-{date.month:02d}-{date.year:04d}"
+
+def iter_data(file_path):
+    """
+    Reads transaction data from a CSV file one row at a time.
+    
+    Only one row is held in memory at a time, so large files can be processed
+    without building the full list of transactions.
+    
+    Args:
+        file_path (str): The path to the CSV file containing transaction data.
+    
+    Yields:
+        Transaction: The next Transaction object read from the CSV file.
+        
+    Side effects:
+        Reads data from the CSV file and creates Transaction objects based on the data.
+    """
+    with open(file_path, mode='r', newline='', buffering=CSV_BUFFER_SIZE) as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        # Pull out only the columns we keep, in Transaction's argument order.
+        columns = itemgetter(
+            header.index("Transaction_ID"),
+            header.index("Product"),
+            header.index("Country"),
+            header.index("Value"),
+            header.index("Date")
+        )
+        # Interning shares one string object per distinct product and country
+        # across all rows and lets equal names compare by identity.
+        for transaction_ID, product, country, value, date in map(columns, reader):
+            yield Transaction(transaction_ID, sys.intern(product), sys.intern(country), float(value), parse_date(date))
+
 def load_data(file_path):
     """
     Loads transaction data from a CSV file and returns a list of Transaction objects.
@@ -248,30 +612,319 @@ def load_data(file_path):
     Side effects:
         Reads data from the CSV file and creates Transaction objects based on the data.
     """
-    transactions = []
-    with open(file_path, mode='r') as file:
-        reader = csv.reader(file)
-        next(reader)
-        for row in reader:
-            transaction = Transaction(
-                transaction_ID=row[0],
-                product=row[2],
-                country=row[1],
-                value=float(row[5]),
-                date=parse_date(row[6])
-            )
-            transactions.append(transaction)
+    return list(iter_data(file_path))
+
+def load_data_cached(file_path):
+    """
+    Loads transaction data like load_data, reusing a cache of previously parsed data.
+    
+    The parsed columns are saved next to the CSV file with a '.pickle' suffix,
+    together with the CSV file's size and modification time. The cache is only
+    used while both still match exactly; otherwise the CSV file is parsed again
+    and the cache is rewritten. An exact match is required because unpacking or
+    copying a dataset can give it an older modification time than the cache.
+    
+    The cache is read with pickle, which can run arbitrary code while loading,
+    so it should only be used where others cannot write next to the dataset. For
+    that reason main only uses it when started with --cache. A cache that cannot
+    be read for any reason is ignored, and a new one is written to a temporary
+    file first so an interrupted run cannot leave a truncated cache behind.
+    
+    Args:
+        file_path (str): The path to the CSV file containing transaction data.
+    
+    Returns:
+        list: A list of Transaction objects loaded from the cache or the CSV file.
+        
+    Side effects:
+        Reads the cache or the CSV file, and writes the cache when it is missing or stale.
+    """
+    cache_path = f"{file_path}.pickle"
+    stat = os.stat(file_path)
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    try:
+        with open(cache_path, mode='rb') as file:
+            if pickle.load(file) == stamp:
+                columns = pickle.load(file)
+                return [Transaction(*row) for row in zip(*columns)]
+    except Exception:
+        # A corrupt or foreign cache can fail in many ways; parse the CSV instead.
+        pass
+    transactions = load_data(file_path)
+    columns = (
+        [t.transaction_ID for t in transactions],
+        [t.product for t in transactions],
+        [t.country for t in transactions],
+        [t.value for t in transactions],
+        [t.date for t in transactions]
+    )
+    temp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(mode='wb', dir=os.path.dirname(os.path.abspath(cache_path)),
+                                         prefix=f"{os.path.basename(cache_path)}.", suffix=".tmp",
+                                         delete=False) as file:
+            temp_path = file.name
+            pickle.dump(stamp, file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(columns, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
     return transactions
 
+def format_transaction(t):
+    """
+    Formats a transaction as a single line for display.
+    
+    Args:
+        t (Transaction): The transaction to format.
+    
+    Returns:
+        str: The transaction ID, product, country, value, and date on one line.
+    """
+    return (f"Transaction ID: {t.transaction_ID} | Product: {t.product} | "
+            f"Country: {t.country} | Value: ${t.value} | Date: {format_date(t.date)}")
+
+def print_transactions(transactions):
+    """
+    Prints transactions one per line with a single write to standard output.
+    
+    Args:
+        transactions (list[Transaction]): The transactions to print.
+        
+    Side effects:
+        Writes the formatted transactions to standard output.
+    """
+    if transactions:
+        sys.stdout.write("\n".join(map(format_transaction, transactions)) + "\n")
+
+def filter_menu(system, state):
+    """
+    Prompts the user for filter criteria and displays the matching transactions.
+    
+    Args:
+        system (ImportExportSystem): The system to filter transactions from.
+        state (dict): The menu state holding the most recent filtered transactions.
+        
+    Side effects:
+        Reads user input, prints the filtered transactions, and stores them in state.
+    """
+    print("\nFilter Transactions:")
+    start_date = input("Enter start date (dd-mm-yyyy) or press Enter to skip: ")
+    end_date = input("Enter end date (dd-mm-yyyy) or press Enter to skip: ")
+    country = input("Enter country or press Enter to skip: ")
+    product = input("Enter product or press Enter to skip: ")
+    min_value = input("Enter minimum value (0 - 10000) or press Enter to skip: ")
+    max_value = input("Enter maximum value (0 - 10000) or press Enter to skip: ")
+
+    date_range = None
+    if start_date and end_date:
+        date_range = (parse_date(start_date), parse_date(end_date))
+    min_value = float(min_value) if min_value else None
+    max_value = float(max_value) if max_value else None
+    filtered = system.filter_transactions(date_range, country or None, product or None, min_value, max_value)
+    state["filtered"] = filtered
+    if filtered:
+        state["filtered_created"] = True
+        print(f"\nFiltered Transactions ({len(filtered)} results):")
+        print_transactions(filtered)
+    else:
+        print("No transactions match the filters.")
+
+def sort_menu(system, state):
+    """
+    Prompts the user for a sort order and displays the sorted transactions.
+    
+    Args:
+        system (ImportExportSystem): The system whose transactions are sorted.
+        state (dict): The menu state holding the most recent filtered transactions.
+        
+    Side effects:
+        Reads user input and prints the sorted transactions.
+    """
+    print("\nSort Transactions by Value:")
+    sort_choice = input("Do you want to sort the filtered transactions (f) or all transactions (a)? ").lower()
+    if sort_choice == "f" and state["filtered_created"]:
+        print("\nSort Filtered Transactions by Value:")
+        transactions = state["filtered"]
+        label = "Sorted Filtered Transactions"
+    elif sort_choice == "a":
+        print("\nSort All Transactions by Value:")
+        transactions = system.transactions
+        label = "Sorted All Transactions"
+    else:
+        print("Invalid choice. Either the input was not recognized, or you attempted to use a filtered transaction list when none exists.")
+        return
+
+    order = input("Enter 'asc' for ascending or 'desc' for descending: ").lower()
+    if order not in ('asc', 'desc'):
+        print("Invalid choice. Please enter 'asc' or 'desc'.")
+        return
+    top_k = input("Enter how many transactions to show or press Enter to show all: ")
+    if top_k and not top_k.isdecimal():
+        print("Invalid choice. Please enter a whole number.")
+        return
+    top_k = int(top_k) if top_k else None
+    sorted_transactions = system.sort_transactions_by_value(transactions, order == 'desc', top_k)
+
+    print(f"\n{label} ({len(sorted_transactions)} results):")
+    print_transactions(sorted_transactions)
+
+def add_menu(system, state):
+    """
+    Prompts the user for the details of a new transaction and adds it.
+    
+    Args:
+        system (ImportExportSystem): The system to add the transaction to.
+        state (dict): The menu state (unused).
+        
+    Side effects:
+        Reads user input and adds a transaction to the system.
+    """
+    print("\nAdd a New Transaction:")
+    transaction_ID = input("Enter transaction ID: ")
+    product = input("Enter product name: ")
+    country = input("Enter country: ")
+    value = float(input("Enter transaction value: "))
+    date_str = input("Enter transaction date (dd-mm-yyyy): ")
+    date = parse_date(date_str)
+    system.add_transaction(transaction_ID, country, product, value, date)
+    print("Transaction added successfully!")
+
+def update_menu(system, state):
+    """
+    Prompts the user for a transaction ID and new details and updates the transaction.
+    
+    Args:
+        system (ImportExportSystem): The system containing the transaction.
+        state (dict): The menu state (unused).
+        
+    Side effects:
+        Reads user input and updates a transaction in the system.
+    """
+    print("\nUpdate an Existing Transaction:")
+    transaction_ID = input("Enter the transaction ID to update: ")
+    product = input("Enter new product name (or press Enter to skip): ")
+    country = input("Enter new country (or press Enter to skip): ")
+    value = input("Enter new transaction value (or press Enter to skip): ")
+    date_str = input("Enter new transaction date (dd-mm-yyyy) (or press Enter to skip): ")
+    date = parse_date(date_str) if date_str else None
+    value = float(value) if value else None
+    success = system.update_transaction(transaction_ID, country or None, product or None, value, date)
+    if success:
+        print("Transaction updated successfully!")
+    else:
+        print("Transaction not found.")
+
+def delete_menu(system, state):
+    """
+    Prompts the user for a transaction ID and deletes the transaction.
+    
+    Args:
+        system (ImportExportSystem): The system containing the transaction.
+        state (dict): The menu state (unused).
+        
+    Side effects:
+        Reads user input and deletes a transaction from the system.
+    """
+    print("\nDelete a Transaction:")
+    transaction_ID = input("Enter the transaction ID to delete: ")
+    success = system.delete_transaction(transaction_ID)
+    if success:
+        print("Transaction deleted successfully!")
+    else:
+        print("Transaction not found.")
+
+def search_menu(system, state):
+    """
+    Prompts the user for a transaction ID and displays the transaction.
+    
+    Args:
+        system (ImportExportSystem): The system to search.
+        state (dict): The menu state (unused).
+        
+    Side effects:
+        Reads user input and prints the matching transaction.
+    """
+    print("\nSearch Transaction by ID:")
+    transaction_ID = input("Enter the transaction ID to search for: ")
+    transaction = system.search_transaction_by_id(transaction_ID)
+    if transaction:
+        print(format_transaction(transaction))
+    else:
+        print("Transaction not found.")
+
+def summary_menu(system, state):
+    """
+    Displays a summary of either the filtered or all transactions.
+    
+    Args:
+        system (ImportExportSystem): The system to summarize.
+        state (dict): The menu state holding the most recent filtered transactions.
+        
+    Side effects:
+        Reads user input and prints the transaction summary.
+    """
+    print("\nTransaction Summary:")
+    summary_choice = input("Do you want a summary of the filtered transactions (f) or all transactions (a)? ").lower()
+    if summary_choice == "f" and state["filtered_created"]:
+        summary = system.generate_transaction_summary(state["filtered"])
+        print(f"Total Filtered Transactions: {summary[0]}")
+        print(f"Total Filtered Trade Value: ${round(summary[1], 2)}")
+        print(f"Average Filtered Trade Value: ${round(summary[2], 2)}")
+    elif summary_choice == "a":
+        summary = system.generate_transaction_summary(system.transactions)
+        print(f"Total Transactions: {summary[0]}")
+        print(f"Total Trade Value: ${round(summary[1], 2)}")
+        print(f"Average Trade Value: ${round(summary[2], 2)}")
+    else:
+        print("Invalid choice. Either the input was not recognized, or you attempted to use a filtered transaction list when none exists.")
+
+def export_menu(system, state):
+    """
+    Exports either the filtered or all transactions to a CSV file.
+    
+    Args:
+        system (ImportExportSystem): The system to export from.
+        state (dict): The menu state holding the most recent filtered transactions.
+        
+    Side effects:
+        Reads user input and writes the transactions to a CSV file.
+    """
+    print("\nExport Transactions to CSV:")
+    export_choice = input("Do you want to export the filtered transactions (f) or all transactions (a)? ").lower()
+    if export_choice == "f" and state["filtered_created"]:
+        filename = input("Enter the filename to save as (e.g., 'output.csv'): ")
+        system.export_transactions_to_csv(state["filtered"], filename)
+        print(f"Filtered transactions exported successfully to {filename}!")
+    elif export_choice == "a":
+        filename = input("Enter the filename to save as (e.g., 'output.csv'): ")
+        system.export_transactions_to_csv(system.transactions, filename)
+        print(f"All transactions exported successfully to {filename}!")
+    else:
+        print("Invalid choice. Either the input was not recognized, or you attempted to use a filtered transaction list when none exists.")
+
+# Maps each main menu choice to the function that handles it.
+MENU_ACTIONS = {
+    "1": filter_menu,
+    "2": sort_menu,
+    "3": add_menu,
+    "4": update_menu,
+    "5": delete_menu,
+    "6": search_menu,
+    "7": summary_menu,
+    "8": export_menu,
+}
+
 def main():
     """
     Runs the Import/Export Management System allowing user interaction.
     """
     file_path = 'Imports_Exports_Dataset.csv'
-    transactions = load_data(file_path)
-
-    system = ImportExportSystem(transactions)
-    filtered_created = False
+    # Caching the parsed data between runs is opt-in; see load_data_cached.
+    loader = load_data_cached if "--cache" in sys.argv[1:] else load_data
+    system = ImportExportSystem(loader(file_path))
+    state = {"filtered": [], "filtered_created": False}
 
     while True:
         print("\nImport/Export Management System")
@@ -287,149 +940,12 @@ def main():
 
         choice = input("Enter your choice (1-9): ")
 
-        if choice == "1":
-            print("\nFilter Transactions:")
-            start_date = input("Enter start date (dd-mm-yyyy) or press Enter to skip: ")
-            end_date = input("Enter end date (dd-mm-yyyy) or press Enter to skip: ")
-            country = input("Enter country or press Enter to skip: ")
-            product = input("Enter product or press Enter to skip: ")
-            min_value = input("Enter minimum value (0 - 10000) or press Enter to skip: ")
-            max_value = input("Enter maximum value (0 - 10000) or press Enter to skip: ")
-
-            date_range = None
-            if start_date and end_date:
-                date_range = (parse_date(start_date), parse_date(end_date))
-            if min_value:
-                min_value = float(min_value)
-            if max_value:
-                max_value = float(max_value)
-            filtered = system.filter_transactions(date_range, country, product, min_value, max_value)
-            if filtered:
-                filtered_created = True
-                print(f"\nFiltered Transactions ({len(filtered)} results):")
-                for t in filtered:
-                    print(f"Transaction ID: {t.transaction_ID} | Product: {t.product} | "
-                          f"Country: {t.country} | Value: ${t.value} | Date: {t.date.strftime('%d-%m-%Y')}")
-            else:
-                print("No transactions match the filters.")
-
-        elif choice == "2":
-            print("\nSort Transactions by Value:")
-            sort_choice = input("Do you want to sort the filtered transactions (f) or all transactions (a)? ").lower()
-            if sort_choice == "f" and filtered_created:
-                print("\nSort Filtered Transactions by Value:")
-                order = input("Enter 'asc' for ascending or 'desc' for descending: ").lower()
-                if order == 'desc':
-                    sorted_transactions = system.sort_transactions_by_value(filtered, True)
-                elif order == 'asc':
-                    sorted_transactions = system.sort_transactions_by_value(filtered, False)
-                else:
-                    print("Invalid choice. Please enter 'asc' or 'desc'.")
-                    continue
-
-                print(f"\nSorted Filtered Transactions ({len(sorted_transactions)} results):")
-                for t in sorted_transactions:
-                    print(f"Transaction ID: {t.transaction_ID} | Product: {t.product} | "
-                          f"Country: {t.country} | Value: ${t.value} | Date: {t.date.strftime('%d-%m-%Y')}")
-            elif sort_choice == "a":
-                print("\nSort All Transactions by Value:")
-                order = input("Enter 'asc' for ascending or 'desc' for descending: ").lower()
-                if order == 'desc':
-                    sorted_transactions = system.sort_transactions_by_value(transactions, descending=True)
-                elif order == 'asc':
-                    sorted_transactions = system.sort_transactions_by_value(transactions, descending=False)
-                else:
-                    print("Invalid choice. Please enter 'asc' or 'desc'.")
-                    continue
-                
-                print(f"\nSorted All Transactions ({len(sorted_transactions)} results):")
-                for t in sorted_transactions:
-                    print(f"Transaction ID: {t.transaction_ID} | Product: {t.product} | "
-                          f"Country: {t.country} | Value: ${t.value} | Date: {t.date.strftime('%d-%m-%Y')}")
-            else:
-                print("Invalid choice. Either the input was not recognized, or you attempted to use a filtered transaction list when none exists.")
-
-        elif choice == "3":
-            print("\nAdd a New Transaction:")
-            transaction_ID = input("Enter transaction ID: ")
-            product = input("Enter product name: ")
-            country = input("Enter country: ")
-            value = float(input("Enter transaction value: "))
-            date_str = input("Enter transaction date (dd-mm-yyyy): ")
-            date = parse_date(date_str)
-            system.add_transaction(transaction_ID, product, country, value, date)
-            print("Transaction added successfully!")
-
-        elif choice == "4":
-            print("\nUpdate an Existing Transaction:")
-            transaction_ID = input("Enter the transaction ID to update: ")
-            product = input("Enter new product name (or press Enter to skip): ")
-            country = input("Enter new country (or press Enter to skip): ")
-            value = input("Enter new transaction value (or press Enter to skip): ")
-            date_str = input("Enter new transaction date (dd-mm-yyyy) (or press Enter to skip): ")
-            if date_str:
-                date = parse_date(date_str)
-            if value:
-                value = float(value)
-            success = system.update_transaction(transaction_ID, country, product, value, date)
-            if success:
-                print("Transaction updated successfully!")
-            else:
-                print("Transaction not found.")
-
-        elif choice == "5":
-            print("\nDelete a Transaction:")
-            transaction_ID = input("Enter the transaction ID to delete: ")
-            success = system.delete_transaction(transaction_ID)
-            if success:
-                print("Transaction deleted successfully!")
-            else:
-                print("Transaction not found.")
-
-        elif choice == "6":
-            print("\nSearch Transaction by ID:")
-            transaction_ID = input("Enter the transaction ID to search for: ")
-            transaction = system.search_transaction_by_id(transaction_ID)
-            if transaction:
-                print(f"Transaction ID: {transaction.transaction_ID} | Product: {transaction.product} | "
-                      f"Country: {transaction.country} | Value: ${transaction.value} | Date: {transaction.date.strftime('%d-%m-%Y')}")
-            else:
-                print("Transaction not found.")
-
-        elif choice == "7":
-            print("\nTransaction Summary:")
-            summary_choice = input("Do you want a summary of the filtered transactions (f) or all transactions (a)? ").lower()
-            if summary_choice == "f" and filtered_created:
-                summary = system.generate_transaction_summary(filtered)
-                print(f"Total Filtered Transactions: {summary[0]}")
-                print(f"Total Filtered Trade Value: ${round(summary[1], 2)}")
-                print(f"Average Filtered Trade Value: ${round(summary[2], 2)}")
-            elif summary_choice == "a":
-                summary = system.generate_transaction_summary(transactions)
-                print(f"Total Transactions: {summary[0]}")
-                print(f"Total Trade Value: ${round(summary[1], 2)}")
-                print(f"Average Trade Value: ${round(summary[2], 2)}")
-            else:
-                print("Invalid choice. Either the input was not recognized, or you attempted to use a filtered transaction list when none exists.")
-
-        elif choice == "8":
-            print("\nExport Transactions to CSV:")
-            export_choice = input("Do you want to export the filtered transactions (f) or all transactions (a)? ").lower()
-            if export_choice == "f" and filtered_created:
-                filename = input("Enter the filename to save as (e.g., 'output.csv'): ")
-                system.export_transactions_to_csv(filtered, filename)
-                print(f"Filtered transactions exported successfully to {filename}!")
-            elif export_choice == "a":
-                filename = input("Enter the filename to save as (e.g., 'output.csv'): ")
-                system.export_transactions_to_csv(transactions, filename)
-                print(f"All transactions exported successfully to {filename}!")
-            else:
-                print("Invalid choice. Either the input was not recognized, or you attempted to use a filtered transaction list when none exists.")
-
+        action = MENU_ACTIONS.get(choice)
+        if action is not None:
+            action(system, state)
         elif choice == "9":
             print("Exiting program...")
             break
-
         else:
             print("Invalid choice. Please enter a number between 1 and 9.")
 
@@ -1,5 +1,9 @@
 import pytest
-from imports_exports import ImportExportSystem, Transaction, parse_date
+import csv
+import math
+import os
+import pickle
+from imports_exports import ImportExportSystem, Transaction, iter_data, load_data, load_data_cached, parse_date, print_transactions, add_menu, filter_menu, sort_menu, update_menu
 
 # To run: python -m pytest
 
@@ -16,6 +20,21 @@ def setup_system():
     ]
     return ImportExportSystem(transactions)
 
+# Setup system with parsed dates, as the menus use
+@pytest.fixture
+def menu_system():
+    transactions = [
+        Transaction(transaction_ID="1", country="USA", product="Electronics", value=1000.0, date=parse_date("01-01-2021")),
+        Transaction(transaction_ID="2", country="Canada", product="Electronics", value=1500.0, date=parse_date("15-01-2021")),
+        Transaction(transaction_ID="3", country="USA", product="Furniture", value=2000.0, date=parse_date("20-01-2021"))
+    ]
+    return ImportExportSystem(transactions)
+
+# Answer the menu prompts with the given inputs, in order
+def feed_input(monkeypatch, answers):
+    answers = iter(answers)
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+
 # Test filter transactions by country
 def test_filter_transactions_by_country(setup_system):
     system = setup_system
@@ -139,4 +158,366 @@ def test_search_transaction_by_id(setup_system):
     system = setup_system
     transaction = system.search_transaction_by_id("1")
     assert transaction is not None, "Expected to find transaction with ID 1."
-    assert transaction.transaction_ID == "1", "Expected transaction ID to be 1."
\ No newline at end of file
+    assert transaction.transaction_ID == "1", "Expected transaction ID to be 1."
+
+# Test that deleting a transaction does not affect searching for the others
+def test_delete_transaction_keeps_other_ids_searchable(setup_system):
+    system = setup_system
+    system.delete_transaction("3")
+    for transaction_ID in ("1", "2", "4", "5"):
+        transaction = system.search_transaction_by_id(transaction_ID)
+        assert transaction is not None, f"Expected to find transaction with ID {transaction_ID}."
+        assert transaction.transaction_ID == transaction_ID, f"Expected transaction ID to be {transaction_ID}."
+    assert not system.delete_transaction("3"), "Expected deleting an already deleted transaction to fail."
+
+# Test filter transactions with a max_value of zero
+def test_filter_transactions_zero_max_value(setup_system):
+    system = setup_system
+    filtered_transactions = system.filter_transactions(max_value=0.0)
+    assert len(filtered_transactions) == 0, "Expected 0 transactions to be returned when max_value is 0."
+
+# Test updating a transaction's value to zero
+def test_update_transaction_zero_value(setup_system):
+    system = setup_system
+    updated = system.update_transaction("1", value=0.0)
+    assert updated, "Expected transaction to be updated successfully."
+    transaction = system.search_transaction_by_id("1")
+    assert transaction.value == 0.0, "Expected value to be updated to 0.0."
+    assert transaction.country == "USA", "Expected country to be left unchanged."
+
+# Test that filtering by country ignores case and uses updated values
+def test_filter_transactions_case_insensitive_after_update(setup_system):
+    system = setup_system
+    system.update_transaction("2", country="USA")
+    filtered_transactions = system.filter_transactions(country="usa")
+    assert len(filtered_transactions) == 4, f"Expected 4 transactions, but got {len(filtered_transactions)}"
+
+# Test exporting transactions to a CSV file
+def test_export_transactions_to_csv(tmp_path):
+    transactions = [
+        Transaction(transaction_ID="1", country="USA", product="Electronics", value=1000.0, date=parse_date("01-01-2021")),
+        Transaction(transaction_ID="2", country="Canada", product="Furniture", value=1500.0, date=parse_date("15-01-2021"))
+    ]
+    system = ImportExportSystem(transactions)
+    filename = tmp_path / "output.csv"
+    system.export_transactions_to_csv(transactions, filename)
+    with open(filename, newline='') as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ["Transaction_ID", "Country", "Product", "Value", "Date"], "Expected the header row to be written first."
+    assert rows[1:] == [["1", "USA", "Electronics", "1000.0", "01-01-2021"], ["2", "Canada", "Furniture", "1500.0", "15-01-2021"]], f"Unexpected exported rows: {rows[1:]}"
+
+# Test sorting only the top transactions by value
+def test_sort_transactions_by_value_top_k(setup_system):
+    system = setup_system
+    top = system.sort_transactions_by_value(system.transactions, descending=True, top_k=2)
+    assert [t.transaction_ID for t in top] == ["5", "4"], "Expected the two highest value transactions in descending order."
+    bottom = system.sort_transactions_by_value(system.transactions, descending=False, top_k=2)
+    assert [t.transaction_ID for t in bottom] == ["1", "2"], "Expected the two lowest value transactions in ascending order."
+
+# Test loading transactions from a CSV file whose columns are in a different order
+def test_load_data_reads_columns_by_header(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("Date,Value,Product,Country,Transaction_ID\n07-12-2023,9506.57,Toys,Colombia,abc\n")
+    transactions = load_data(file_path)
+    assert len(transactions) == 1, f"Expected 1 transaction, but got {len(transactions)}"
+    transaction = transactions[0]
+    assert transaction.transaction_ID == "abc", "Expected transaction ID to be abc."
+    assert transaction.country == "Colombia", "Expected country to be Colombia."
+    assert transaction.product == "Toys", "Expected product to be Toys."
+    assert transaction.value == 9506.57, "Expected value to be 9506.57."
+    assert transaction.date == parse_date("07-12-2023"), "Expected date to be 07-12-2023."
+
+# Test deleting the last transaction and then adding a new one
+def test_delete_last_transaction_then_add(setup_system):
+    system = setup_system
+    assert system.delete_transaction("5"), "Expected transaction to be deleted successfully."
+    system.add_transaction("6", "Brazil", "Coffee", 500.0, "01-02-2021")
+    assert len(system.transactions) == 5, "Expected 5 transactions after deleting one and adding one."
+    assert system.search_transaction_by_id("5") is None, "Expected transaction 5 to be gone."
+    assert system.search_transaction_by_id("6").value == 500.0, "Expected to find the new transaction with ID 6."
+
+# Test reading transactions from a CSV file one at a time
+def test_iter_data_matches_load_data(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("Transaction_ID,Country,Product,Value,Date\n1,USA,Toys,10.5,01-01-2021\n2,Chile,Food,20.0,02-01-2021\n")
+    rows = iter_data(file_path)
+    first = next(rows)
+    assert first.transaction_ID == "1", "Expected the first transaction to be read first."
+    remaining = list(rows)
+    assert [t.transaction_ID for t in remaining] == ["2"], "Expected the second transaction to follow."
+    assert [t.transaction_ID for t in load_data(file_path)] == ["1", "2"], "Expected load_data to return every transaction."
+
+# Test that the total trade value does not accumulate rounding error
+def test_total_trade_value_is_accurate():
+    transactions = [Transaction(transaction_ID=str(i), country="USA", product="Toys", value=0.1, date="01-01-2021") for i in range(10)]
+    system = ImportExportSystem(transactions)
+    assert system.total_trade_value(transactions) == 1.0, "Expected ten values of 0.1 to total exactly 1.0."
+
+# Test that sorting all transactions reflects transactions added after an earlier sort
+def test_sort_all_transactions_after_add(setup_system):
+    system = setup_system
+    system.sort_transactions_by_value(system.transactions, descending=False)
+    system.add_transaction("6", "Brazil", "Coffee", 1750.0, "01-02-2021")
+    sorted_transactions = system.sort_transactions_by_value(system.transactions, descending=False)
+    assert [t.transaction_ID for t in sorted_transactions] == ["1", "2", "6", "3", "4", "5"], "Expected the new transaction to be sorted into place."
+
+# Test that cached transaction data is read instead of the unchanged CSV file
+def test_load_data_cached_reads_cache(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("Transaction_ID,Country,Product,Value,Date\n1,USA,Toys,10.5,01-01-2021\n")
+    mtime_ns = os.stat(file_path).st_mtime_ns
+    first = load_data_cached(str(file_path))
+    assert [t.transaction_ID for t in first] == ["1"], "Expected the CSV contents on the first load."
+    assert os.path.exists(f"{file_path}.pickle"), "Expected the parsed data to be cached."
+    # Same size and modification time, so only a cache read can return the old row.
+    file_path.write_text("Transaction_ID,Country,Product,Value,Date\n2,USA,Toys,10.5,01-01-2021\n")
+    os.utime(file_path, ns=(mtime_ns, mtime_ns))
+    cached = load_data_cached(str(file_path))
+    assert [(t.transaction_ID, t.value, t.date) for t in cached] == [("1", 10.5, parse_date("01-01-2021"))], "Expected the cached transactions to be returned."
+
+# Test that the cache is replaced when the CSV file changes, even to an older modification time
+def test_load_data_cached_refreshes_cache(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("Transaction_ID,Country,Product,Value,Date\n1,USA,Toys,10.5,01-01-2021\n")
+    load_data_cached(str(file_path))
+    file_path.write_text("Transaction_ID,Country,Product,Value,Date\n2,Chile,Food,20.0,02-01-2021\n")
+    mtime = os.path.getmtime(f"{file_path}.pickle") - 3600
+    os.utime(file_path, (mtime, mtime))
+    refreshed = load_data_cached(str(file_path))
+    assert [t.transaction_ID for t in refreshed] == ["2"], "Expected a stale cache to be replaced by the CSV contents."
+    assert [t.transaction_ID for t in load_data_cached(str(file_path))] == ["2"], "Expected the rewritten cache to hold the new contents."
+
+# Test that an added transaction keeps its country and product in the right fields
+def test_add_transaction_fields(setup_system):
+    system = setup_system
+    system.add_transaction("6", "Brazil", "Coffee", 500.0, "01-02-2021")
+    transaction = system.search_transaction_by_id("6")
+    assert transaction.country == "Brazil", "Expected the country to be stored as the country."
+    assert transaction.product == "Coffee", "Expected the product to be stored as the product."
+    assert len(system.filter_transactions(country="Brazil", product="Coffee")) == 1, "Expected the new transaction to match its country and product."
+
+# Test printing transactions one per line
+def test_print_transactions(capsys):
+    transactions = [
+        Transaction(transaction_ID="1", country="USA", product="Toys", value=10.5, date=parse_date("01-01-2021")),
+        Transaction(transaction_ID="2", country="Chile", product="Food", value=20.0, date=parse_date("02-01-2021"))
+    ]
+    print_transactions(transactions)
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2, "Expected one line per transaction."
+    assert lines[0] == "Transaction ID: 1 | Product: Toys | Country: USA | Value: $10.5 | Date: 01-01-2021", "Expected the first transaction to be printed first."
+
+# Test that a date range filter finds transactions added after an earlier filter
+def test_filter_date_range_after_add(setup_system):
+    system = setup_system
+    date_range = ("14-01-2021", "16-01-2021")
+    assert [t.transaction_ID for t in system.filter_transactions(date_range=date_range)] == ["2"], "Expected one transaction in the date range."
+    system.add_transaction("6", "Brazil", "Coffee", 500.0, "15-01-2021")
+    filtered = system.filter_transactions(date_range=date_range)
+    assert [t.transaction_ID for t in filtered] == ["2", "6"], "Expected the new transaction to be found in list order."
+
+# Test that deleting one of two transactions with the same ID keeps the other reachable
+def test_delete_duplicate_id(setup_system):
+    system = setup_system
+    system.add_transaction("X1", "Brazil", "Coffee", 500.0, "01-02-2021")
+    system.add_transaction("X1", "Chile", "Copper", 600.0, "02-02-2021")
+    assert system.delete_transaction("X1"), "Expected the first X1 transaction to be deleted."
+    remaining = system.search_transaction_by_id("X1")
+    assert remaining is not None and remaining.country == "Chile", "Expected the second X1 transaction to be found."
+    assert system.delete_transaction("X1"), "Expected the second X1 transaction to be deleted."
+    assert system.search_transaction_by_id("X1") is None, "Expected no X1 transactions to remain."
+    assert len(system.transactions) == 5, "Expected only the original transactions to remain."
+
+# Test that dates with non-ASCII digits are rejected like strptime rejects them
+def test_parse_date_rejects_non_ascii_digits():
+    with pytest.raises(ValueError):
+        parse_date("\u0660\u0661-\u0660\u0661-\u0662\u0660\u0662\u0661")
+    assert parse_date("01-02-2021").month == 2, "Expected ASCII dates to parse as before."
+
+# Test deleting a transaction whose ID is shared by the last transaction, which moves into its place
+def test_delete_moves_last_transaction_with_same_id(setup_system):
+    system = setup_system
+    system.add_transaction("X1", "Brazil", "Coffee", 500.0, "01-02-2021")
+    system.add_transaction("6", "Peru", "Gold", 700.0, "03-02-2021")
+    system.add_transaction("X1", "Chile", "Copper", 600.0, "02-02-2021")
+    assert system.delete_transaction("X1"), "Expected the first X1 transaction to be deleted."
+    assert system.transactions[5].country == "Chile", "Expected the last transaction to move into the freed position."
+    assert system.search_transaction_by_id("X1") is system.transactions[5], "Expected the moved X1 transaction to be found at its new position."
+    assert system.search_transaction_by_id("6").country == "Peru", "Expected the other transactions to stay searchable."
+    assert system.delete_transaction("X1"), "Expected the moved X1 transaction to be deleted."
+    assert system.search_transaction_by_id("X1") is None, "Expected no X1 transactions to remain."
+
+# Test that the sort menu rejects a count that is not a plain whole number
+def test_sort_menu_rejects_non_decimal_count(menu_system, monkeypatch, capsys):
+    feed_input(monkeypatch, ["a", "asc", "\u00b2"])
+    sort_menu(menu_system, {"filtered": [], "filtered_created": False})
+    assert "Please enter a whole number." in capsys.readouterr().out, "Expected the count to be rejected."
+
+# Test that transactions appended to the list directly are picked up by the cached indexes
+def test_indexes_follow_direct_append(setup_system):
+    system = setup_system
+    system.sort_transactions_by_value(system.transactions, descending=True)
+    system.filter_transactions(country="Brazil", date_range=("01-02-2021", "01-02-2021"))
+    system.transactions.append(Transaction(transaction_ID="6", country="Brazil", product="Coffee", value=5000.0, date="01-02-2021"))
+    sorted_transactions = system.sort_transactions_by_value(system.transactions, descending=True)
+    assert sorted_transactions[0].transaction_ID == "6", "Expected the appended transaction to be sorted first."
+    assert len(system.filter_transactions(country="Brazil")) == 1, "Expected the appended transaction to match its country."
+    assert len(system.filter_transactions(date_range=("01-02-2021", "01-02-2021"))) == 1, "Expected the appended transaction to match its date."
+    assert system.search_transaction_by_id("6") is not None, "Expected the appended transaction to be found by ID."
+
+# Test that a negative number of sorted transactions is rejected
+def test_sort_transactions_negative_top_k(setup_system):
+    system = setup_system
+    with pytest.raises(ValueError):
+        system.sort_transactions_by_value(system.transactions, descending=False, top_k=-1)
+    with pytest.raises(ValueError):
+        system.sort_transactions_by_value(list(system.transactions), descending=False, top_k=-1)
+
+# Test the filter menu stores and prints the matching transactions
+def test_filter_menu(menu_system, monkeypatch, capsys):
+    state = {"filtered": [], "filtered_created": False}
+    feed_input(monkeypatch, ["10-01-2021", "31-01-2021", "usa", "", "", ""])
+    filter_menu(menu_system, state)
+    assert [t.transaction_ID for t in state["filtered"]] == ["3"], "Expected only transaction 3 to match the filters."
+    assert state["filtered_created"], "Expected the filtered list to be marked as created."
+    out = capsys.readouterr().out
+    assert "Filtered Transactions (1 results):" in out, "Expected the number of results to be printed."
+    assert "Transaction ID: 3 | Product: Furniture | Country: USA | Value: $2000.0 | Date: 20-01-2021" in out, "Expected the matching transaction to be printed."
+
+# Test the filter menu when nothing matches
+def test_filter_menu_no_match(menu_system, monkeypatch, capsys):
+    state = {"filtered": [], "filtered_created": False}
+    feed_input(monkeypatch, ["", "", "Peru", "", "", ""])
+    filter_menu(menu_system, state)
+    assert not state["filtered_created"], "Expected no filtered list to be created."
+    assert "No transactions match the filters." in capsys.readouterr().out, "Expected a no-match message."
+
+# Test the sort menu on the filtered transactions
+def test_sort_menu_filtered(menu_system, monkeypatch, capsys):
+    state = {"filtered": [menu_system.transactions[0], menu_system.transactions[2]], "filtered_created": True}
+    feed_input(monkeypatch, ["f", "desc", ""])
+    sort_menu(menu_system, state)
+    lines = [line for line in capsys.readouterr().out.splitlines() if line.startswith("Transaction ID:")]
+    assert [line.split(" | ")[0] for line in lines] == ["Transaction ID: 3", "Transaction ID: 1"], "Expected the filtered transactions in descending order."
+
+# Test the sort menu on all transactions with a count
+def test_sort_menu_all_with_count(menu_system, monkeypatch, capsys):
+    feed_input(monkeypatch, ["a", "asc", "2"])
+    sort_menu(menu_system, {"filtered": [], "filtered_created": False})
+    out = capsys.readouterr().out
+    lines = [line for line in out.splitlines() if line.startswith("Transaction ID:")]
+    assert "Sorted All Transactions (2 results):" in out, "Expected the shown count to be printed."
+    assert [line.split(" | ")[0] for line in lines] == ["Transaction ID: 1", "Transaction ID: 2"], "Expected the two lowest values in ascending order."
+
+# Test the sort menu refuses to sort a filtered list that was never created
+def test_sort_menu_without_filtered(menu_system, monkeypatch, capsys):
+    feed_input(monkeypatch, ["f"])
+    sort_menu(menu_system, {"filtered": [], "filtered_created": False})
+    assert "Invalid choice." in capsys.readouterr().out, "Expected the missing filtered list to be reported."
+
+# Test the update menu changes only the given fields
+def test_update_menu(menu_system, monkeypatch, capsys):
+    feed_input(monkeypatch, ["2", "", "Peru", "99.5", ""])
+    update_menu(menu_system, {"filtered": [], "filtered_created": False})
+    transaction = menu_system.search_transaction_by_id("2")
+    assert transaction.country == "Peru" and transaction.value == 99.5, "Expected the country and value to be updated."
+    assert transaction.product == "Electronics", "Expected the product to be unchanged."
+    assert "Transaction updated successfully!" in capsys.readouterr().out, "Expected a success message."
+    assert len(menu_system.filter_transactions(country="peru")) == 1, "Expected the update to be visible to filters."
+
+# Test the update menu with an unknown ID
+def test_update_menu_not_found(menu_system, monkeypatch, capsys):
+    feed_input(monkeypatch, ["99", "", "", "", ""])
+    update_menu(menu_system, {"filtered": [], "filtered_created": False})
+    assert "Transaction not found." in capsys.readouterr().out, "Expected the unknown ID to be reported."
+
+# Test the add menu stores the product and country in the right fields
+def test_add_menu(menu_system, monkeypatch):
+    feed_input(monkeypatch, ["9", "Coffee", "Brazil", "10", "05-02-2021"])
+    add_menu(menu_system, {"filtered": [], "filtered_created": False})
+    transaction = menu_system.search_transaction_by_id("9")
+    assert transaction.product == "Coffee" and transaction.country == "Brazil", "Expected the product and country to be stored as entered."
+    assert transaction.date == parse_date("05-02-2021"), "Expected the date to be parsed."
+
+# Test that loaded rows share one string object for each repeated country and product
+def test_iter_data_interns_names(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("Transaction_ID,Country,Product,Value,Date\n1,USA,Toys,10.5,01-01-2021\n2,USA,Toys,20.0,02-01-2021\n")
+    first, second = iter_data(file_path)
+    assert first.country is second.country, "Expected the country strings to be shared."
+    assert first.product is second.product, "Expected the product strings to be shared."
+
+# Test that transactions accept str subclasses for product and country
+def test_transaction_accepts_str_subclass(setup_system):
+    class Name(str):
+        pass
+    system = setup_system
+    transaction = Transaction(transaction_ID="6", country=Name("Brazil"), product=Name("Coffee"), value=500.0, date="01-02-2021")
+    assert transaction.country == "Brazil", "Expected the country to be stored."
+    assert system.update_transaction("1", country=Name("Peru"), product=Name("Gold")), "Expected the update to succeed."
+    assert len(system.filter_transactions(country="peru", product="GOLD")) == 1, "Expected the updated names to be matched."
+
+# Test ID lookups after an element of the transactions list is replaced directly
+def test_search_after_direct_replacement(setup_system):
+    system = setup_system
+    replacement = Transaction(transaction_ID="3", country="Peru", product="Gold", value=700.0, date="01-02-2021")
+    system.transactions[0] = replacement
+    assert system.search_transaction_by_id("1") is None, "Expected the replaced transaction's ID to be gone."
+    assert system.search_transaction_by_id("3") is replacement, "Expected the first transaction with ID 3 to be found."
+    assert system.delete_transaction("3"), "Expected the replacement to be deleted."
+    assert system.search_transaction_by_id("3").country == "USA", "Expected the original transaction 3 to remain."
+    assert not system.delete_transaction("1"), "Expected no transaction with ID 1 to delete."
+
+# Test that deleting a transaction moves the last transaction into its place
+def test_delete_transaction_order(setup_system):
+    system = setup_system
+    assert system.delete_transaction("2"), "Expected transaction 2 to be deleted."
+    assert [t.transaction_ID for t in system.transactions] == ["1", "5", "3", "4"], "Expected the last transaction to take the deleted transaction's place."
+
+# Test that filters see country and product changes made directly on a transaction
+def test_filter_after_direct_field_edit(setup_system):
+    system = setup_system
+    assert system.filter_transactions(country="peru") == [], "Expected no Peru transactions at first."
+    transaction = system.search_transaction_by_id("2")
+    transaction.country = "Peru"
+    transaction.product = "Gold"
+    assert system.filter_transactions(country="peru") == [transaction], "Expected the edited country to be matched."
+    assert system.filter_transactions(product="GOLD") == [transaction], "Expected the edited product to be matched."
+    assert len(system.filter_transactions(country="Canada")) == 0, "Expected the old country to no longer match."
+
+# Test that the total trade value handles infinite and very large values
+def test_total_trade_value_non_finite():
+    transactions = [
+        Transaction(transaction_ID="1", country="USA", product="Toys", value=float("inf"), date="01-01-2021"),
+        Transaction(transaction_ID="2", country="USA", product="Toys", value=float("-inf"), date="01-01-2021")
+    ]
+    system = ImportExportSystem(transactions)
+    assert math.isnan(system.total_trade_value(transactions)), "Expected inf plus -inf to total nan."
+    assert math.isnan(system.generate_transaction_summary(transactions)[2]), "Expected the summary to be generated."
+    large = [Transaction(transaction_ID=str(i), country="USA", product="Toys", value=1e308, date="01-01-2021") for i in range(2)]
+    assert system.total_trade_value(large) == float("inf"), "Expected an overflowing total to be inf."
+
+# Test that sorting and date filters see value and date changes made directly on a transaction
+def test_sort_and_date_filter_after_direct_field_edit(setup_system):
+    system = setup_system
+    assert [t.transaction_ID for t in system.sort_transactions_by_value(system.transactions, descending=False, top_k=2)] == ["1", "2"], "Expected the two lowest values first."
+    assert len(system.filter_transactions(date_range=("01-03-2021", "01-03-2021"))) == 0, "Expected no transactions on the new date yet."
+    transaction = system.search_transaction_by_id("1")
+    transaction.value = 9000.0
+    transaction.date = "01-03-2021"
+    assert [t.transaction_ID for t in system.sort_transactions_by_value(system.transactions, descending=False, top_k=2)] == ["2", "3"], "Expected the edited value to move transaction 1."
+    assert system.filter_transactions(date_range=("01-03-2021", "01-03-2021")) == [transaction], "Expected the edited date to be matched."
+
+# Test that a cache that fails to unpickle is ignored and replaced without leaving temporary files
+def test_load_data_cached_ignores_broken_cache(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("Transaction_ID,Country,Product,Value,Date\n1,USA,Toys,10.5,01-01-2021\n")
+    stat = os.stat(file_path)
+    with open(f"{file_path}.pickle", "wb") as file:
+        pickle.dump((stat.st_size, stat.st_mtime_ns), file)
+        # Refers to a name the module does not have, so unpickling raises AttributeError.
+        file.write(b"cimports_exports\nNoSuchName\n.")
+    transactions = load_data_cached(str(file_path))
+    assert [t.transaction_ID for t in transactions] == ["1"], "Expected the CSV to be parsed instead."
+    assert sorted(os.listdir(tmp_path)) == ["data.csv", "data.csv.pickle"], "Expected only the CSV and the rewritten cache."
+    assert [t.transaction_ID for t in load_data_cached(str(file_path))] == ["1"], "Expected the rewritten cache to be readable."